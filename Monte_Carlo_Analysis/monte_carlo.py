@@ -1,174 +1,444 @@
-import backtrader as bt
+import datetime
 import yfinance as yf
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-import random
-from strategy import OpeningMomentumStrategy
+from matplotlib.collections import LineCollection
 import sys
 import os
+import time
+import hashlib
+from multiprocessing import Pool, cpu_count
+
+# Numba is optional: with it installed, very large simulation counts run
+# through a compiled kernel instead of materializing the full bootstrap matrix
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
 
 # Suppress console output during backtest (Commented out to debug)
 # sys.stdout = open(os.devnull, 'w')
 
-def run_backtest():
-    cerebro = bt.Cerebro()
-    
-    # Add Strategy with correct parameters
-    cerebro.addstrategy(OpeningMomentumStrategy, 
-                        daily_loss_limit=200.0,
-                        fixed_size=1,
-                        trail_atr=3.0,
-                        vol_multiplier=3.0,
-                        multiplier=2.0)
+# One PCG64 generator for the whole run (modern Generator API is much faster
+# than the legacy samplers for bulk draws)
+rng = np.random.default_rng()
+
+# Without Numba, runs this large get sharded across a process pool instead
+POOL_MIN_SIMS = 100_000
+
+
+def mc_worker(seed, n_sims, pnls, start):
+    ''' One shard of the bootstrap. Draws its own indices from a spawned
+    seed and returns per-simulation stats plus the equity column sums
+    (for the exact average curve). '''
+    wrng = np.random.default_rng(seed)
+    n_days = len(pnls)
+    idx = wrng.integers(0, n_days, size=(n_sims, n_days), dtype=np.int32)
+    equity = np.empty((n_sims, n_days + 1), dtype=np.float32)
+    equity[:, 0] = start
+    np.cumsum(pnls[idx], axis=1, out=equity[:, 1:])
+    equity[:, 1:] += start
+    peaks = np.maximum.accumulate(equity, axis=1)
+    max_dd = ((peaks - equity) / peaks).max(axis=1)
+    return equity[:, -1], max_dd, equity.sum(axis=0)
+
+
+if HAS_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def mc_kernel(pnls, idx, start):
+        ''' Streams each simulation row once: running equity, peak and
+        max drawdown as scalars, no intermediate matrices. '''
+        n_sims, n_days = idx.shape
+        final_eq = np.empty(n_sims)
+        max_dd = np.empty(n_sims)
+        for s in prange(n_sims):
+            eq = start
+            peak = start
+            dd = 0.0
+            for d in range(n_days):
+                eq += pnls[idx[s, d]]
+                if eq > peak:
+                    peak = eq
+                cur = (peak - eq) / peak
+                if cur > dd:
+                    dd = cur
+            final_eq[s] = eq
+            max_dd[s] = dd
+        return final_eq, max_dd
+
+# Parquet cache for downloaded data - the network fetch + parse dominates a
+# short Monte Carlo run, and the cleaned tz-aware frame survives Parquet
+# round trips losslessly
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+CACHE_MAX_AGE = 24 * 3600 # Re-download after a day
+
+
+def load_data(symbol="NQ=F", fallback="QQQ", period="59d", interval="5m"):
+    # The cache file is named after the symbol the data actually came from,
+    # so a fallback download can never sit on disk labeled as the primary.
+    # Prefer the primary symbol's cache and say which one a hit served.
+    for sym in (symbol, fallback):
+        cache_path = os.path.join(
+            CACHE_DIR, f"{sym.replace('=', '')}_{period}_{interval}.parquet")
+        if os.path.exists(cache_path) and time.time() - os.path.getmtime(cache_path) < CACHE_MAX_AGE:
+            print(f"Loaded cached {sym} data ({os.path.basename(cache_path)})")
+            return pd.read_parquet(cache_path, engine='pyarrow')
 
     # Data Loading (Same as strategy.py)
+    used_symbol = symbol
     try:
-        data_source = yf.download("NQ=F", period="59d", interval="5m", progress=False)
+        data_source = yf.download(symbol, period=period, interval=interval, progress=False)
         if len(data_source) == 0:
-             data_source = yf.download("QQQ", period="59d", interval="5m", progress=False)
+             used_symbol = fallback
+             data_source = yf.download(fallback, period=period, interval=interval, progress=False)
     except Exception:
-        data_source = yf.download("QQQ", period="59d", interval="5m", progress=False)
+        used_symbol = fallback
+        data_source = yf.download(fallback, period=period, interval=interval, progress=False)
+
+    if len(data_source) == 0:
+        # Do not poison the cache with an empty frame (e.g. a transient
+        # network failure) - fail loudly and let the next run retry
+        raise RuntimeError(
+            f"Download returned no data for {symbol} (fallback {fallback})")
+
+    if used_symbol != symbol:
+        print(f"{symbol} download failed - using {used_symbol} as proxy")
 
     if isinstance(data_source.columns, pd.MultiIndex):
-        data_source.columns = data_source.columns.get_level_values(0)
+        data_source.columns = data_source.columns.droplevel(1)
 
-    if data_source.index.tz is None:
-        data_source.index = data_source.index.tz_localize('UTC').tz_convert('US/Eastern')
-    else:
-        data_source.index = data_source.index.tz_convert('US/Eastern')
-    
-    data_source.dropna(inplace=True)
-    
-    data = bt.feeds.PandasData(dataname=data_source)
-    cerebro.adddata(data)
+    # Normalize to a DatetimeIndex up front so the tz math below runs on the
+    # vectorized datetime64 path (pandas >= 2.1), never through per-element
+    # datetime objects
+    idx = pd.DatetimeIndex(data_source.index)
+    if idx.tz is None:
+        idx = idx.tz_localize('UTC')
+    data_source.index = idx.tz_convert('US/Eastern')
+
+    # Only the columns the backtest reads need the NaN mask
+    data_source.dropna(subset=['Open', 'High', 'Low', 'Close', 'Volume'],
+                       inplace=True)
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    cache_path = os.path.join(
+        CACHE_DIR, f"{used_symbol.replace('=', '')}_{period}_{interval}.parquet")
+    data_source.to_parquet(cache_path, engine='pyarrow', compression='zstd')
+    return data_source
+
+
+def run_vector_backtest(data_source,
+                        daily_loss_limit=200.0, fixed_size=1, trail_atr=3.0,
+                        vol_multiplier=3.0, multiplier=2.0, commission=0.6):
+    ''' Pure-NumPy re-implementation of OpeningMomentumStrategy for Monte
+    Carlo seeding. Same signals as the cerebro run of strategy.py -
+    first-bar entry, ATR trailing reversal, volume-spike reversal, daily
+    loss halt, forced flatten - but over plain float arrays instead of
+    per-bar callbacks. backtrader converts a tz-aware feed to naive UTC
+    internally, so the live strategy keys its 09:35 entry, 15:45 flatten
+    and daily resets off UTC wall time; the session logic here mirrors
+    that clock to keep the trade population aligned. Fills are
+    approximated at the signal bar close with a flat round-turn
+    commission.
+
+    Returns (close_times, trade_pnls) for the closed trades, timestamped
+    on the same naive-UTC clock. '''
+    o = data_source['Open'].to_numpy(dtype=np.float64)
+    h = data_source['High'].to_numpy(dtype=np.float64)
+    l = data_source['Low'].to_numpy(dtype=np.float64)
+    c = data_source['Close'].to_numpy(dtype=np.float64)
+    v = data_source['Volume'].to_numpy(dtype=np.float64)
+
+    # Indicators, computed once over the full history:
+    # ATR(14) with Wilder smoothing (matches bt.indicators.ATR) and SMA(20)
+    prev_c = np.concatenate([[np.nan], c[:-1]])
+    tr = np.maximum(h - l, np.maximum(np.abs(h - prev_c), np.abs(l - prev_c)))
+    atr = pd.Series(tr).ewm(alpha=1.0 / 14, adjust=False, min_periods=14).mean().to_numpy()
+    vol_ma = pd.Series(v).rolling(20).mean().to_numpy()
+
+    # Trade on the clock the cerebro feed actually sees (naive UTC), not
+    # the US/Eastern labels on the frame
+    index = data_source.index
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    bar_times = index.time
+    bar_dates = index.date
+
+    first_bar_close = datetime.time(9, 35)
+    market_close = datetime.time(15, 45)
+
+    round_turn = 2 * commission * fixed_size
+    close_times = []
+    trade_pnls = []
+
+    # Day boundaries as index ranges
+    day_starts = np.flatnonzero(np.concatenate([[True], bar_dates[1:] != bar_dates[:-1]]))
+    day_ends = np.append(day_starts[1:], len(c))
+
+    for s, e in zip(day_starts, day_ends):
+        entry_rel = np.flatnonzero(bar_times[s:e] == first_bar_close)
+        if len(entry_rel) == 0:
+            continue
+        i = s + entry_rel[0]
+
+        # Indicator warmup: backtrader doesn't call next() until the
+        # ATR(14)/SMA(20) minimum periods are filled, so skip days whose
+        # entry bar still sits in the NaN region (a NaN here would silently
+        # disable both reversal rules for the whole day)
+        if np.isnan(atr[i]) or np.isnan(vol_ma[i]):
+            continue
+
+        # First bar of day: Long if Close > Open, else Short
+        side = 1 if c[i] > o[i] else -1
+        entry_px = c[i]
+        highest_high = h[i]
+        lowest_low = l[i]
+        daily_pnl = 0.0
 
-    # Broker Settings ($5000, 1 MNQ)
-    cerebro.broker.setcash(5000.0)
-    cerebro.broker.setcommission(commission=0.6, margin=50.0, mult=2.0)
-    cerebro.broker.set_slippage_perc(0.0001)
+        for j in range(i + 1, e):
+            px = c[j]
+            unreal = (px - entry_px) * side * multiplier * fixed_size
 
-    # Analyzers
-    cerebro.addanalyzer(bt.analyzers.TradeAnalyzer, _name="trades")
+            # Daily loss limit: close all and halt for the day
+            if daily_pnl + unreal < -daily_loss_limit:
+                close_times.append(index[j])
+                trade_pnls.append(unreal - round_turn)
+                break
 
-    # Run
-    results = cerebro.run()
-    return results[0]
+            # Market close: flatten
+            if bar_times[j] >= market_close:
+                close_times.append(index[j])
+                trade_pnls.append(unreal - round_turn)
+                break
+
+            # Update extremes
+            if side > 0:
+                highest_high = max(highest_high, h[j])
+            else:
+                lowest_low = min(lowest_low, l[j])
+
+            # A. Trailing reversal
+            reversal_dist = atr[j] * trail_atr
+            reverse = ((side > 0 and px < highest_high - reversal_dist) or
+                       (side < 0 and px > lowest_low + reversal_dist))
+
+            # B. Volume spike + counter-trend candle
+            if not reverse and v[j] > vol_ma[j] * vol_multiplier:
+                reverse = ((side > 0 and px < c[j - 1]) or
+                           (side < 0 and px > c[j - 1]))
+
+            if reverse:
+                pnl = unreal - round_turn
+                daily_pnl += pnl
+                close_times.append(index[j])
+                trade_pnls.append(pnl)
+                side = -side
+                entry_px = px
+                if side > 0:
+                    highest_high = h[j]
+                else:
+                    lowest_low = l[j]
+        else:
+            # Data ran out mid-day with a position still open - flatten
+            j = e - 1
+            unreal = (c[j] - entry_px) * side * multiplier * fixed_size
+            close_times.append(index[j])
+            trade_pnls.append(unreal - round_turn)
+
+    return close_times, np.asarray(trade_pnls, dtype=np.float64)
 
 # --- MAIN ANALYSIS ---
-# sys.stdout = sys.__stdout__ # Restore print
-print("Running base backtest for simulation...")
-strat = run_backtest()
+def main():
+    # sys.stdout = sys.__stdout__ # Restore print
+    data_source = load_data()
 
-# Extract Trades
-daily_pnls = {}
+    # The backtest is deterministic given the data and the strategy params, so
+    # its daily PnLs are cached keyed by a hash of both. Re-runs that only
+    # tweak the Monte Carlo side (SIMULATIONS etc.) skip the backtest entirely.
+    backtest_params = dict(daily_loss_limit=200.0, fixed_size=1, trail_atr=3.0,
+                           vol_multiplier=3.0, multiplier=2.0, commission=0.6)
+    key = hashlib.blake2b(
+        data_source.to_numpy().tobytes() + repr(sorted(backtest_params.items())).encode(),
+        digest_size=16).hexdigest()
+    pnl_cache_path = os.path.join(CACHE_DIR, f'pnls_{key}.npy')
 
-# Access strategy internal trade list
-trade_list = strat._trades[strat.datas[0]][0] # Closed trade list
+    if os.path.exists(pnl_cache_path):
+        pnl_sequence = np.load(pnl_cache_path)
+        print(f"Loaded cached daily PnLs ({len(pnl_sequence)} days)")
+    else:
+        print("Running vectorized base backtest for simulation...")
+        close_times, pnl_arr = run_vector_backtest(data_source, **backtest_params)
 
-print(f"Total Closed Trades extracted: {len(trade_list)}")
+        print(f"Total Closed Trades extracted: {len(pnl_arr)}")
 
-for trade in trade_list:
-    # Get date of trade CLOSE
-    # Use dtclose (float) and convert to date
-    date = trade.dtclose
-    date_key = bt.num2date(date).date()
-    
-    pnl = trade.pnlcomm
-    
-    if date_key not in daily_pnls:
-        daily_pnls[date_key] = 0.0
-    daily_pnls[date_key] += pnl
+        # Bucket trade PnLs per close date with one groupby; normalize() strips
+        # the time-of-day from all close timestamps in a single vectorized call
+        close_dates = pd.DatetimeIndex(close_times).normalize()
+        daily_pnls = pd.Series(pnl_arr).groupby(close_dates).sum()
 
-pnl_sequence = list(daily_pnls.values())
-days = len(pnl_sequence)
+        pnl_sequence = daily_pnls.to_numpy()
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        np.save(pnl_cache_path, pnl_sequence)
 
-print(f"Total Trading Days: {days}")
-print(f"Average Daily PnL: ${np.mean(pnl_sequence):.2f}")
+    days = len(pnl_sequence)
 
-# --- MONTE CARLO SIMULATION ---
-SIMULATIONS = 1000
-STARTING_EQUITY = 5000.0
+    print(f"Total Trading Days: {days}")
+    print(f"Average Daily PnL: ${np.mean(pnl_sequence):.2f}")
 
-final_equities = []
-max_drawdowns = []
-all_curves = []
+    # --- MONTE CARLO SIMULATION ---
+    SIMULATIONS = 1000
+    STARTING_EQUITY = 5000.0
 
-print(f"Running {SIMULATIONS} Monte Carlo Simulations (Shuffling Days)...")
+    print(f"Running {SIMULATIONS} Monte Carlo Simulations (Shuffling Days)...")
 
-for i in range(SIMULATIONS):
     # Bootstrapping (Resample with Replacement)
     # This varies the Final Equity and tests "What if we had more/less luck with good days?"
-    daily_seq = random.choices(pnl_sequence, k=days)
-    
-    # Calculate Curve
-    equity = [STARTING_EQUITY]
-    peak = STARTING_EQUITY
-    drawdown = 0.0
-    
-    for pnl in daily_seq:
-        new_val = equity[-1] + pnl
-        equity.append(new_val)
-        
-        # DD Calc
-        if new_val > peak:
-            peak = new_val
-        dd = (peak - new_val) / peak
-        if dd > drawdown:
-            drawdown = dd
-            
-    final_equities.append(equity[-1])
-    max_drawdowns.append(drawdown * 100) # Percentage
-    all_curves.append(equity)
-
-# --- PLOTTING ---
-plt.figure(figsize=(12, 8))
-
-# 1. Equity Curves
-plt.subplot(2, 2, 1)
-plt.title(f"Monte Carlo: 1000 Equity Curves (Shuffle)")
-plt.ylabel("Account Equity ($)")
-plt.xlabel("Trading Days")
-for curve in all_curves[:100]: # Plot 100 random ones
-    plt.plot(curve, color='gray', alpha=0.1)
-# Plot Average
-avg_curve = np.mean(all_curves, axis=0)
-plt.plot(avg_curve, color='blue', linewidth=2, label='Average')
-plt.axhline(y=STARTING_EQUITY, color='r', linestyle='--')
-plt.legend()
-
-# 2. Final Equity Distribution
-plt.subplot(2, 2, 2)
-plt.title("Distribution of Final Equity")
-plt.hist(final_equities, bins=10, color='green', alpha=0.7)
-plt.axvline(x=STARTING_EQUITY, color='red', linestyle='--', label='Start')
-plt.xlabel("Final Equity ($)")
-plt.legend()
-
-# 3. Max Drawdown Distribution
-plt.subplot(2, 2, 3)
-plt.title("Distribution of Max Drawdown")
-plt.hist(max_drawdowns, bins=10, color='red', alpha=0.7)
-plt.xlabel("Max Drawdown (%)")
-
-# 4. Metrics Text
-plt.subplot(2, 2, 4)
-plt.axis('off')
-roi_avg = np.mean(final_equities) - STARTING_EQUITY
-risk_of_ruin = sum(1 for x in final_equities if x < 2500) / SIMULATIONS * 100 # <50% equity left
-dd_95 = np.percentile(max_drawdowns, 95)
-
-text_str = (
-    f"Simulation Metrics (Based on Reverted Strategy):\n\n"
-    f"Mean Final Equity: ${np.mean(final_equities):.2f}\n"
-    f"Mean Net Profit: ${roi_avg:.2f}\n"
-    f"Best Case: ${np.max(final_equities):.2f}\n"
-    f"Worst Case: ${np.min(final_equities):.2f}\n\n"
-    f"95% Confidence Drawdown: < {dd_95:.2f}%\n"
-    f"Risk of Ruin (<50%): {risk_of_ruin:.1f}%"
-)
-plt.text(0.1, 0.5, text_str, fontsize=12)
-
-plt.tight_layout()
-plt.savefig('monte_carlo_results.png')
-print("Simulation complete. Saved to monte_carlo_results.png")
+    # All simulations are drawn and evaluated in one shot: a (SIMULATIONS, days)
+    # index matrix replaces the per-simulation random.choices() calls, and the
+    # equity curves / drawdowns become cumulative NumPy ops instead of a nested
+    # Python loop.
+    # float32 everywhere the MC arrays are memory-bound: daily PnLs are ~$100 on
+    # a ~$5000 stake, so 7 digits of precision is ample, and the half-width rows
+    # double the SIMD lanes. Final scalar stats accumulate in float64 below.
+    pnl_array = np.asarray(pnl_sequence, dtype=np.float32)
+
+    if HAS_NUMBA:
+        # Fused path: the kernel streams each row once with equity, peak and
+        # drawdown as scalars - one pass over the index matrix where the NumPy
+        # path below reads full-size matrices three times (cumsum, accumulate,
+        # max) - and never holds the equity matrix at all
+        idx = rng.integers(0, days, size=(SIMULATIONS, days), dtype=np.int32)
+        final_equities, max_dd_frac = mc_kernel(pnl_array, idx, STARTING_EQUITY)
+        max_drawdowns = max_dd_frac * 100 # Percentage
+
+        # Plotting only ever shows up to 100 curves, so build just those.
+        # Display arrays are float32 - half the bytes, ample precision for a
+        # chart.
+        n_curves = min(100, SIMULATIONS)
+        sample_curves = np.concatenate(
+            [np.full((n_curves, 1), STARTING_EQUITY),
+             STARTING_EQUITY + np.cumsum(pnl_array[idx[:n_curves]], axis=1)],
+            axis=1).astype(np.float32)
+        # Exact average curve without the matrix: per-day column means
+        col_means = np.array([pnl_array[idx[:, d]].mean() for d in range(days)])
+        avg_curve = np.concatenate(
+            [[STARTING_EQUITY], STARTING_EQUITY + np.cumsum(col_means)]).astype(np.float32)
+    elif SIMULATIONS >= POOL_MIN_SIMS and cpu_count() > 1:
+        # No compiled kernel but lots of simulations: shard across processes.
+        # SeedSequence.spawn keeps the workers' streams independent; the root
+        # entropy is printed so a run can be replayed by seeding SeedSequence
+        # with it explicitly.
+        root_seed = np.random.SeedSequence()
+        print(f"Monte Carlo root seed entropy: {root_seed.entropy}")
+        n_workers = cpu_count()
+        shard = SIMULATIONS // n_workers
+        shard_sizes = [shard + SIMULATIONS % n_workers] + [shard] * (n_workers - 1)
+        seeds = root_seed.spawn(n_workers)
+
+        with Pool(n_workers) as pool:
+            parts = pool.starmap(
+                mc_worker,
+                [(sd, n, pnl_array, STARTING_EQUITY)
+                 for sd, n in zip(seeds, shard_sizes)])
+
+        final_equities = np.concatenate([p[0] for p in parts])
+        max_drawdowns = np.concatenate([p[1] for p in parts]) * 100 # Percentage
+        avg_curve = (np.sum([p[2] for p in parts], axis=0) / SIMULATIONS).astype(np.float32)
+
+        # Display-only sample: up to 100 fresh paths drawn locally (the stats
+        # above all come from the workers)
+        n_curves = min(100, SIMULATIONS)
+        sample_idx = rng.integers(0, days, size=(n_curves, days), dtype=np.int32)
+        sample_curves = np.concatenate(
+            [np.full((n_curves, 1), STARTING_EQUITY),
+             STARTING_EQUITY + np.cumsum(pnl_array[sample_idx], axis=1)],
+            axis=1).astype(np.float32)
+    else:
+        idx = rng.integers(0, days, size=(SIMULATIONS, days), dtype=np.int32)
+        samples = pnl_array[idx]
+
+        # Equity curves: column 0 is the starting stake, then a running cumsum
+        # of PnLs, written straight into one preallocated buffer instead of
+        # concatenating temporaries
+        equity = np.empty((SIMULATIONS, days + 1), dtype=np.float32)
+        equity[:, 0] = STARTING_EQUITY
+        np.cumsum(samples, axis=1, out=equity[:, 1:])
+        equity[:, 1:] += STARTING_EQUITY
+
+        # DD Calc: running peak via maximum.accumulate, worst drawdown per row.
+        # Branchless single pass - no per-element peak/drawdown comparisons.
+        peaks = np.maximum.accumulate(equity, axis=1)
+        dd_series = (peaks - equity) / peaks
+        max_drawdowns = dd_series.max(axis=1) * 100 # Percentage
+
+        # Copies, not views: a view would keep the whole equity matrix alive.
+        # The display-only curves drop to float32 on the way out.
+        final_equities = equity[:, -1].copy()
+        sample_curves = equity[:100].astype(np.float32)
+        avg_curve = equity.mean(axis=0).astype(np.float32)
+
+        # Plotting only needs the extracts above - release the big matrices now
+        del samples, equity, peaks, dd_series
+
+    # --- PLOTTING ---
+    plt.figure(figsize=(12, 8))
+
+    # 1. Equity Curves
+    plt.subplot(2, 2, 1)
+    plt.title(f"Monte Carlo: 1000 Equity Curves (Shuffle)")
+    plt.ylabel("Account Equity ($)")
+    plt.xlabel("Trading Days")
+    # All 100 sample curves as a single LineCollection artist instead of 100
+    # separate Line2D objects
+    xs = np.arange(days + 1)
+    segs = [np.column_stack([xs, curve]) for curve in sample_curves]
+    ax = plt.gca()
+    ax.add_collection(LineCollection(segs, colors='gray', alpha=0.1))
+    ax.autoscale()
+    # Plot Average
+    plt.plot(avg_curve, color='blue', linewidth=2, label='Average')
+    plt.axhline(y=STARTING_EQUITY, color='r', linestyle='--')
+    plt.legend()
+
+    # 2. Final Equity Distribution
+    plt.subplot(2, 2, 2)
+    plt.title("Distribution of Final Equity")
+    plt.hist(final_equities, bins=10, color='green', alpha=0.7)
+    plt.axvline(x=STARTING_EQUITY, color='red', linestyle='--', label='Start')
+    plt.xlabel("Final Equity ($)")
+    plt.legend()
+
+    # 3. Max Drawdown Distribution
+    plt.subplot(2, 2, 3)
+    plt.title("Distribution of Max Drawdown")
+    plt.hist(max_drawdowns, bins=10, color='red', alpha=0.7)
+    plt.xlabel("Max Drawdown (%)")
+
+    # 4. Metrics Text
+    plt.subplot(2, 2, 4)
+    plt.axis('off')
+    # Scalar stats accumulate in float64 to avoid float32 summation bias
+    mean_final = np.mean(final_equities, dtype=np.float64)
+    roi_avg = mean_final - STARTING_EQUITY
+    risk_of_ruin = (final_equities < STARTING_EQUITY * 0.5).mean() * 100 # <50% equity left
+    dd_95 = np.percentile(max_drawdowns, 95)
+
+    text_str = (
+        f"Simulation Metrics (Based on Reverted Strategy):\n\n"
+        f"Mean Final Equity: ${mean_final:.2f}\n"
+        f"Mean Net Profit: ${roi_avg:.2f}\n"
+        f"Best Case: ${np.max(final_equities):.2f}\n"
+        f"Worst Case: ${np.min(final_equities):.2f}\n\n"
+        f"95% Confidence Drawdown: < {dd_95:.2f}%\n"
+        f"Risk of Ruin (<50%): {risk_of_ruin:.1f}%"
+    )
+    plt.text(0.1, 0.5, text_str, fontsize=12)
+
+    plt.tight_layout()
+    plt.savefig('monte_carlo_results.png')
+    print("Simulation complete. Saved to monte_carlo_results.png")
+
+
+if __name__ == '__main__':
+    main()
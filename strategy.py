@@ -24,11 +24,31 @@ class OpeningMomentumStrategy(bt.Strategy):
         self.datahigh = self.datas[0].high
         self.datalow = self.datas[0].low
         self.volume = self.datas[0].volume
+
+        # Raw data line buffers - indexed by bar number in next(), same
+        # trick as the indicator arrays below
+        self._open_arr = self.dataopen.array
+        self._high_arr = self.datahigh.array
+        self._low_arr = self.datalow.array
+        self._close_arr = self.dataclose.array
+        self._vol_arr = self.volume.array
         
         # Indicators
         self.atr = bt.indicators.ATR(self.datas[0], period=14)
         self.vol_ma = bt.indicators.SMA(self.volume, period=20)
 
+        # Raw line buffers for the indicators. In runonce mode backtrader
+        # fills these arrays up-front, so indexing them by bar number in
+        # next() skips the LineBuffer __getitem__ dispatch on every bar.
+        self._atr_arr = self.atr.lines[0].array
+        self._vol_ma_arr = self.vol_ma.lines[0].array
+
+        # Session times (constants - hoisted out of next() so no datetime
+        # objects get built per bar).
+        # On 5m bars the 09:30 open bar closes at 09:35; we act then.
+        self._first_bar_close = datetime.time(9, 35)
+        self._market_close = datetime.time(15, 45) # Force exit
+
         # State tracking
         self.current_day = None
         self.start_day_value = None
@@ -108,74 +128,76 @@ class OpeningMomentumStrategy(bt.Strategy):
         if self.check_daily_loss_limit():
             return
 
-        # Define Times
-        market_open = datetime.time(9, 30)
-        market_close = datetime.time(15, 45) # Force exit
-        
-        # Calculate when the "First Bar" Logic applies
-        # If we use 5m bars: 09:30 bar closes at 09:35. We act then.
-        first_bar_close = (datetime.datetime.combine(datetime.date.today(), market_open) + datetime.timedelta(minutes=5)).time()
+        # Bind the hot lookups as locals once per bar - every self.params.*
+        # read goes through backtrader's AutoInfoClass descriptor chain and
+        # every line [0] through a LineBuffer __getitem__ otherwise
+        p = self.params
+        pos = self.position
+        psize = pos.size
+        i = len(self) - 1 # Current bar index into the raw buffers
+        close0 = self._close_arr[i]
+        high0 = self._high_arr[i]
+        low0 = self._low_arr[i]
 
         # 2. MARKET CLOSE EXIT
-        if current_time >= market_close:
-            if self.position:
+        if current_time >= self._market_close:
+            if pos:
                 self.log('Market Close - Flattening')
                 self.close()
             return
 
         # 3. ENTRY: FIRST BAR OF DAY
         # We check strictly at the bar that completes the first 5 minutes
-        if current_time == first_bar_close:
-            if not self.position:
-                if self.dataclose[0] > self.dataopen[0]:
+        if current_time == self._first_bar_close:
+            if not pos:
+                if close0 > self._open_arr[i]:
                     self.log('FIRST BAR LONG: Close > Open')
-                    self.buy(size=self.params.fixed_size)
-                    self.highest_high = self.datahigh[0]
-                else: 
+                    self.buy(size=p.fixed_size)
+                    self.highest_high = high0
+                else:
                     self.log('FIRST BAR SHORT: Close < Open')
-                    self.sell(size=self.params.fixed_size)
-                    self.lowest_low = self.datalow[0]
+                    self.sell(size=p.fixed_size)
+                    self.lowest_low = low0
             return
 
         # 4. TRADE MANAGEMENT (SAR)
-        if self.position:
-            
+        if pos:
             # Update Extremes
-            if self.position.size > 0:
-                self.highest_high = max(self.highest_high, self.datahigh[0])
-            elif self.position.size < 0:
-                self.lowest_low = min(self.lowest_low, self.datalow[0])
+            if psize > 0:
+                self.highest_high = max(self.highest_high, high0)
+            elif psize < 0:
+                self.lowest_low = min(self.lowest_low, low0)
 
             # --- REVERSAL LOGIC ---
             reversal_triggered = False
-            
+
             # A. TRAILING REVERSAL (Price moves against trend by X ATR)
-            reversal_dist = self.atr[0] * self.params.trail_atr
-            
-            if self.position.size > 0: # We are Long
-                if self.dataclose[0] < (self.highest_high - reversal_dist):
+            reversal_dist = self._atr_arr[i] * p.trail_atr
+
+            if psize > 0: # We are Long
+                if close0 < (self.highest_high - reversal_dist):
                     self.reverse_position("Trailing Stop")
                     reversal_triggered = True
-            
-            elif self.position.size < 0: # We are Short
-                if self.dataclose[0] > (self.lowest_low + reversal_dist):
+
+            elif psize < 0: # We are Short
+                if close0 > (self.lowest_low + reversal_dist):
                     self.reverse_position("Trailing Stop")
                     reversal_triggered = True
 
             # B. VOLUME REVERSAL (Spike + Counter-Trend Candle)
             # Only check if Trail didn't already trigger
             if not reversal_triggered:
-                is_vol_spike = self.volume[0] > (self.vol_ma[0] * self.params.vol_multiplier)
-                
+                is_vol_spike = self._vol_arr[i] > (self._vol_ma_arr[i] * p.vol_multiplier)
+
                 if is_vol_spike:
-                    if self.position.size > 0: # Long
+                    if psize > 0: # Long
                         # If huge volume and we close LOWER than prev close (Bearish shift)
-                        if self.dataclose[0] < self.dataclose[-1]:
+                        if close0 < self._close_arr[i - 1]:
                             self.reverse_position("Volume Spike Bearish")
-                    
-                    elif self.position.size < 0: # Short
+
+                    elif psize < 0: # Short
                         # If huge volume and we close HIGHER than prev close (Bullish shift)
-                        if self.dataclose[0] > self.dataclose[-1]:
+                        if close0 > self._close_arr[i - 1]:
                             self.reverse_position("Volume Spike Bullish")
 
 if __name__ == '__main__':
@@ -199,7 +221,7 @@ if __name__ == '__main__':
     
     # FIX: Flatten MultiIndex columns if present (common with newer yfinance)
     if isinstance(data_source.columns, pd.MultiIndex):
-        data_source.columns = data_source.columns.get_level_values(0)
+        data_source.columns = data_source.columns.droplevel(1)
     
     # CONVERT TO EASTERN TIME
     if data_source.index.tz is None:
@@ -210,8 +232,9 @@ if __name__ == '__main__':
         data_source.index = data_source.index.tz_convert('US/Eastern')
         print("Data converted to US/Eastern")
 
-    # Clean up any NaN rows
-    data_source.dropna(inplace=True)
+    # Clean up any NaN rows (only the columns the feed reads)
+    data_source.dropna(subset=['Open', 'High', 'Low', 'Close', 'Volume'],
+                       inplace=True)
 
     # Create Backtrader Data Feed
     data = bt.feeds.PandasData(dataname=data_source)